@@ -0,0 +1,203 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Module that contains tests for tpDcc-libs-plugin PluginFactory
+"""
+
+import os
+
+import pytest
+
+from tpDcc.libs.plugin.core import factory as factory_module
+from tpDcc.libs.plugin.core.factory import PluginFactory
+
+
+def _write_file(file_path, contents=''):
+    folder = os.path.dirname(file_path)
+    if not os.path.isdir(folder):
+        os.makedirs(folder)
+    with open(file_path, 'w') as fh:
+        fh.write(contents)
+
+
+@pytest.fixture
+def nested_plugins(tmpdir, monkeypatch, request):
+    """
+    Creates an importable package with an Alpha plugin in its root folder and a Beta plugin in a sub folder
+    """
+
+    package_name = 'plugins_{}'.format(request.node.name)
+    root_path = os.path.join(str(tmpdir), package_name)
+    sub_path = os.path.join(root_path, 'sub')
+    _write_file(os.path.join(root_path, '__init__.py'))
+    _write_file(os.path.join(sub_path, '__init__.py'))
+    _write_file(os.path.join(root_path, 'alpha.py'), 'class Alpha(object):\n    pass\n')
+    _write_file(os.path.join(sub_path, 'beta.py'), 'class Beta(object):\n    pass\n')
+    monkeypatch.syspath_prepend(str(tmpdir))
+
+    return root_path, sub_path
+
+
+def test_unregister_nested_path(nested_plugins):
+    root_path, sub_path = nested_plugins
+    factory = PluginFactory(object)
+    factory.register_path(root_path)
+    factory.register_path(sub_path)
+    assert factory.identifiers() == {'Alpha', 'Beta'}
+
+    factory.unregister_path(sub_path)
+    assert factory.paths('tpDcc') == [root_path]
+    assert factory.identifiers() == {'Alpha', 'Beta'}
+
+    factory.unregister_path(root_path)
+    assert factory.identifiers() == set()
+
+
+def test_unregister_path_with_shared_plugins(nested_plugins):
+    root_path, sub_path = nested_plugins
+    factory = PluginFactory(object, paths=[root_path])
+    other_factory = PluginFactory(object, paths=[sub_path])
+
+    factory.unregister_path(root_path)
+    assert factory.identifiers() == set()
+    assert other_factory.identifiers() == {'Beta'}
+
+
+def test_register_path_skips_invalid_versioned_plugins(tmpdir):
+    plugins_path = os.path.join(str(tmpdir), 'plugins')
+    _write_file(os.path.join(plugins_path, 'versioned_plugins.py'), '\n'.join([
+        'class Alpha(object):', '    VERSION = "1.0"',
+        'class Zeta(object):', '    pass',
+        'class Omega(object):', '    VERSION = "5.0"', '']))
+    factory = PluginFactory(object, paths=[plugins_path], version_id='VERSION')
+
+    assert factory.identifiers() == {'Alpha', 'Omega'}
+    assert factory.get_plugin_from_id('Omega', package_name='tpDcc').VERSION == '5.0'
+    assert factory.get_plugin_from_id('Zeta', package_name='tpDcc') is None
+
+
+def test_register_plugin_from_class_into_new_package():
+
+    class Plugin(object):
+        pass
+
+    factory = PluginFactory(object)
+
+    assert factory.register_plugin_from_class(Plugin, package_name='myPackage')
+    assert factory.identifiers(package_name='myPackage') == {'Plugin'}
+    assert factory.get_plugin_from_id('Plugin', package_name='myPackage') is Plugin
+
+
+def test_reload_does_not_resolve_dotted_paths_again(tmpdir, monkeypatch):
+    plugins_path = os.path.join(str(tmpdir), 'plugins')
+    for plugin_name in ('first', 'second', 'third'):
+        _write_file(os.path.join(plugins_path, 'dotted_{}.py'.format(plugin_name)))
+
+    resolved_paths = list()
+    convert_to_dotted_path = factory_module.modules.convert_to_dotted_path
+
+    def _convert_to_dotted_path(file_path):
+        resolved_paths.append(file_path)
+        return convert_to_dotted_path(file_path)
+
+    monkeypatch.setattr(factory_module.modules, 'convert_to_dotted_path', _convert_to_dotted_path)
+
+    factory = PluginFactory(object, paths=[plugins_path])
+    assert len(resolved_paths) == 3
+    factory.reload()
+    factory.reload()
+    assert len(resolved_paths) == 3
+
+    # Dotted paths depend on sys.path, so they are resolved again when it changes
+    monkeypatch.syspath_prepend(plugins_path)
+    factory.reload()
+    assert len(resolved_paths) == 6
+
+
+def test_get_plugin_from_id_with_multiple_versions():
+    factory = PluginFactory(object, version_id='VERSION')
+    for plugin_version in ('2.0', '3.0', '1.0'):
+        plugin_class = type('Plugin', (object,), {'VERSION': plugin_version})
+        assert factory.register_plugin_from_class(plugin_class, package_name='myPackage')
+
+    assert factory.get_plugin_from_id('Plugin', package_name='myPackage').VERSION == '3.0'
+    assert factory.get_plugin_from_id('Plugin', package_name='myPackage', plugin_version='2.0').VERSION == '2.0'
+    assert factory.get_plugin_from_id('Plugin', package_name='myPackage', plugin_version='4.0') is None
+
+
+def test_versions_are_sorted_numerically():
+    factory = PluginFactory(object, version_id='VERSION')
+    for plugin_version in ('1.10', '1.9', '1.0a', '1.0'):
+        factory.register_plugin_from_class(type('Plugin', (object,), {'VERSION': plugin_version}), 'myPackage')
+
+    assert factory.versions('Plugin', package_name='myPackage') == ['1.0', '1.0a', '1.9', '1.10']
+    assert factory.get_plugin_from_id('Plugin', package_name='myPackage').VERSION == '1.10'
+
+
+def test_reload_finds_files_added_to_nested_folders(tmpdir):
+    plugins_path = os.path.join(str(tmpdir), 'plugins')
+    nested_path = os.path.join(plugins_path, 'first', 'second')
+    _write_file(os.path.join(nested_path, 'scan_existing.py'), 'class Existing(object):\n    pass\n')
+    os.utime(nested_path, (0, 0))
+    factory = PluginFactory(object, paths=[plugins_path])
+    assert factory.identifiers() == {'Existing'}
+
+    _write_file(os.path.join(nested_path, 'scan_added.py'), 'class Added(object):\n    pass\n')
+    factory.reload()
+    assert factory.identifiers() == {'Existing', 'Added'}
+
+
+def test_reload_does_not_search_unchanged_paths(tmpdir, monkeypatch):
+    plugins_path = os.path.join(str(tmpdir), 'plugins')
+    _write_file(os.path.join(plugins_path, 'nested', 'scan_unchanged.py'), 'class Unchanged(object):\n    pass\n')
+
+    searched_paths = list()
+    iter_plugin_files = PluginFactory._iter_plugin_files
+
+    def _iter_plugin_files(self, path, directories=None):
+        searched_paths.append(path)
+        return iter_plugin_files(self, path, directories)
+
+    monkeypatch.setattr(PluginFactory, '_iter_plugin_files', _iter_plugin_files)
+
+    factory = PluginFactory(object, paths=[plugins_path])
+    factory.reload()
+    assert searched_paths == [plugins_path]
+    assert factory.identifiers() == {'Unchanged'}
+
+
+def test_reload_reuses_unchanged_source_loaded_plugins(tmpdir):
+    plugins_path = os.path.join(str(tmpdir), 'plugins')
+    _write_file(os.path.join(plugins_path, 'source_unchanged.py'), 'class Unchanged(object):\n    pass\n')
+    factory = PluginFactory(object)
+    factory.register_path(plugins_path, mechanism=PluginFactory.PluginLoadingMechanism.LOAD_SOURCE)
+    plugin = factory.get_plugin_from_id('Unchanged')
+
+    factory.reload()
+    assert factory.get_plugin_from_id('Unchanged') is plugin
+
+
+def test_reload_loads_modified_source_loaded_plugins(tmpdir):
+    plugins_path = os.path.join(str(tmpdir), 'plugins')
+    plugin_path = os.path.join(plugins_path, 'source_modified.py')
+    _write_file(plugin_path, 'class Modified(object):\n    VERSION = "1.0"\n')
+    os.utime(plugin_path, (0, 0))
+    factory = PluginFactory(object)
+    factory.register_path(plugins_path, mechanism=PluginFactory.PluginLoadingMechanism.LOAD_SOURCE)
+    assert factory.get_plugin_from_id('Modified').VERSION == '1.0'
+
+    _write_file(plugin_path, 'class Modified(object):\n    VERSION = "2.0"\n')
+    factory.reload()
+    assert factory.get_plugin_from_id('Modified').VERSION == '2.0'
+
+
+def test_unregister_path_releases_source_loaded_modules(tmpdir):
+    plugins_path = os.path.join(str(tmpdir), 'plugins')
+    _write_file(os.path.join(plugins_path, 'source_released.py'), 'class Released(object):\n    pass\n')
+    factory = PluginFactory(object)
+    factory.register_path(plugins_path, mechanism=PluginFactory.PluginLoadingMechanism.LOAD_SOURCE)
+    assert factory._source_loaded
+
+    factory.unregister_path(plugins_path)
+    assert not factory._source_loaded
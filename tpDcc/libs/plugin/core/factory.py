@@ -10,14 +10,134 @@ from __future__ import print_function, division, absolute_import
 import os
 import re
 import sys
-import inspect
+import types
+import bisect
 import logging
-from distutils import version
+from collections import deque
+try:
+    from os import scandir
+except ImportError:
+    scandir = None
 
-from tpDcc.libs.python import python, modules, path as path_utils, folder as folder_utils
+from tpDcc.libs.python import python, modules, path as path_utils
 
 logger = logging.getLogger('tpDcc-libs-python')
 
+# Python 2 old style classes are not instances of type
+_CLASS_TYPES = (type, types.ClassType) if hasattr(types, 'ClassType') else (type,)
+
+# Caches used to avoid resolving the same module paths each time a path is registered
+_MODULE_CACHES_MAX_SIZE = 4096
+_DOTTED_PATHS_CACHE = dict()
+_DOTTED_PATHS_CACHE_KEY = None
+_INIT_DIRS_CACHE = dict()
+_VERSION_KEYS_CACHE = dict()
+
+# Regex used to split version strings into its numeric and alphabetic components
+_VERSION_COMPONENTS_REGEX = re.compile(r'\d+|[a-zA-Z]+')
+
+
+def _validate_dotted_paths_cache():
+    """
+    Clears cached dotted module paths if sys.path or current working directory changed since they were resolved
+    """
+
+    global _DOTTED_PATHS_CACHE_KEY
+
+    cache_key = (tuple(sys.path), os.getcwd())
+    if _DOTTED_PATHS_CACHE_KEY != cache_key:
+        _DOTTED_PATHS_CACHE.clear()
+        _DOTTED_PATHS_CACHE_KEY = cache_key
+
+
+def _dotted_for(file_path):
+    """
+    Returns the dotted module path of the given Python file. Results are cached by file path until sys.path or
+    current working directory changes
+    :param file_path: str, absolute file path of a Python file
+    :return: str or None
+    """
+
+    try:
+        return _DOTTED_PATHS_CACHE[file_path]
+    except KeyError:
+        pass
+
+    module_name = modules.convert_to_dotted_path(file_path)
+    if len(_DOTTED_PATHS_CACHE) >= _MODULE_CACHES_MAX_SIZE:
+        _DOTTED_PATHS_CACHE.clear()
+    _DOTTED_PATHS_CACHE[file_path] = module_name
+
+    return module_name
+
+
+def _version_key(version_str):
+    """
+    Returns a sortable key for the given version string. Numeric components are compared as integers and are
+    considered lower than alphabetic ones (1.0 < 1.0a < 1.1). Results are cached by version string
+    :param version_str: str, version string
+    :return: tuple
+    """
+
+    try:
+        return _VERSION_KEYS_CACHE[version_str]
+    except KeyError:
+        pass
+
+    version_key = tuple(
+        (0, int(component), '') if component.isdigit() else (1, 0, component)
+        for component in _VERSION_COMPONENTS_REGEX.findall(version_str))
+    if len(_VERSION_KEYS_CACHE) >= _MODULE_CACHES_MAX_SIZE:
+        _VERSION_KEYS_CACHE.clear()
+    _VERSION_KEYS_CACHE[version_str] = version_key
+
+    return version_key
+
+
+def _path_key(path):
+    """
+    Returns the key used to check if given path was already registered. Python files are detected by their
+    extension to avoid a stat call per path
+    :param path: str, file or directory path
+    :return: str
+    """
+
+    file_name, extension = os.path.splitext(path)
+    return path_utils.clean_path(file_name if extension in ('.py', '.pyc') else path)
+
+
+def _get_mtime(path):
+    """
+    Returns the modification time of the given path. Nanoseconds are used if available (Python 3) so changes done
+    within the same second are also detected
+    :param path: str, file or directory path
+    :return: int or float
+    """
+
+    stat = os.stat(path)
+    return getattr(stat, 'st_mtime_ns', stat.st_mtime)
+
+
+def _has_init(directory):
+    """
+    Returns whether or not given directory contains an __init__ file. Results are cached by directory
+    :param directory: str, absolute directory path
+    :return: bool
+    """
+
+    try:
+        return _INIT_DIRS_CACHE[directory]
+    except KeyError:
+        pass
+
+    has_init = any(
+        os.path.isfile(os.path.join(directory, '__init__{}'.format(extension))) for extension in ('.py', '.pyc'))
+    if len(_INIT_DIRS_CACHE) >= _MODULE_CACHES_MAX_SIZE:
+        _INIT_DIRS_CACHE.clear()
+    _INIT_DIRS_CACHE[directory] = has_init
+
+    return has_init
+
 
 class PluginFactory(object):
 
@@ -41,11 +161,14 @@ class PluginFactory(object):
         # are available on the sys.path, the class names will resolve nicely too
         IMPORTABLE = 2
 
-    # Regex validator for plugin folder directories
+    # Regex validator for plugin folder directories. Kept for compatibility, folders are skipped by name
     REGEX_FOLDER_VALIDATOR = re.compile('^((?!__pycache__).)*$')
 
+    # Names of the folders that are never searched for plugins
+    _SKIP_DIR_NAMES = frozenset({'__pycache__', '.git', '.tox', '.mypy_cache', '__MACOSX'})
+
     # Regex validator for plugin file names
-    REGEX_FILE_VALIDATOR = re.compile(r'([a-zA-Z].*)(\.py$|\.pyc$)')
+    REGEX_FILE_VALIDATOR = re.compile(r'[a-zA-Z][^/\\]*\.pyc?\Z')
 
     def __init__(self, interface, paths=None, package_name=None, plugin_id=None, version_id=None, env_var=None):
         """
@@ -59,12 +182,22 @@ class PluginFactory(object):
         :param env_var: str, optional environment variable name containing paths to register separated by OS separator.
         """
 
+        import inspect
+
         self._interface = interface
         self._plugin_identifier = plugin_id or '__name__'
         self._version_identifier = version_id
+        self._callable_predicate = inspect.ismethod if python.is_python2() else inspect.isfunction
 
         self._plugins = dict()
+        self._plugin_index = dict()
+        self._versions_index = dict()
         self._registered_paths = dict()
+        self._path_plugins = dict()
+        self._identifiers_cache = dict()
+        self._versions_cache = dict()
+        self._scan_cache = dict()
+        self._source_loaded = dict()
 
         self.register_paths(paths, package_name=package_name)
         if env_var:
@@ -98,21 +231,10 @@ class PluginFactory(object):
         self._registered_paths[package_name][path] = mechanism
 
         current_plugins_count = len(self._plugins)
+        path_plugins = self._path_plugins.setdefault((package_name, path), list())
 
-        file_paths = list()
-        for root, _, files in folder_utils.walk_level(path):
-            if not self.REGEX_FOLDER_VALIDATOR.match(root):
-                continue
-
-            for file_name in files:
-
-                # Skip files that do not match PluginFactory regex validator.
-                if not self.REGEX_FILE_VALIDATOR.match(file_name):
-                    continue
-                if file_name.startswith('test') or file_name in ['setup.py']:
-                    continue
-
-                file_paths.append(path_utils.clean_path(os.path.join(root, file_name)))
+        file_paths = self._get_plugin_files(path)
+        _validate_dotted_paths_cache()
 
         # Loop through all the found files searching for plugins definitions
         for file_path in file_paths:
@@ -133,19 +255,21 @@ class PluginFactory(object):
             if not module_to_inspect:
                 continue
 
-            try:
-                for item_name in dir(module_to_inspect):
-                    item = getattr(module_to_inspect, item_name)
-                    if inspect.isclass(item):
-                        if item == self._interface:
-                            continue
-                        if issubclass(item, self._interface):
-                            item.ROOT = path
-                            item.PATH = file_path
-                            self._plugins.setdefault(package_name, list())
-                            self._plugins[package_name].append(item)
-            except BaseException:
-                logger.debug('', exc_info=True)
+            for item in list(vars(module_to_inspect).values()):
+                if not isinstance(item, _CLASS_TYPES) or item is self._interface:
+                    continue
+                # Each class is registered independently, so a failing class does not skip the rest of the module
+                try:
+                    if not issubclass(item, self._interface):
+                        continue
+                    item.ROOT = path
+                    item.PATH = file_path
+                    self._index_plugin(item, package_name)
+                except BaseException:
+                    logger.debug('', exc_info=True)
+                    continue
+                self._plugins.setdefault(package_name, list()).append(item)
+                path_plugins.append(item)
 
         return len(self._plugins) - current_plugins_count
 
@@ -159,20 +283,12 @@ class PluginFactory(object):
         :return: int, total amount of registered plugins
         """
 
-        paths = python.force_list(paths)
-
-        total_plugins = 0
         visited = set()
-        for path in paths:
-            if not path:
-                continue
-            base_name = path_utils.clean_path(os.path.splitext(path)[0] if os.path.isfile(path) else path)
-            if base_name in visited:
-                continue
-            visited.add(base_name)
-            total_plugins += self.register_path(path, package_name=package_name, mechanism=mechanism)
+        unique_paths = (
+            path for path, base_name in ((path, _path_key(path)) for path in python.force_list(paths) if path)
+            if base_name not in visited and not visited.add(base_name))
 
-        return total_plugins
+        return sum(self.register_path(path, package_name=package_name, mechanism=mechanism) for path in unique_paths)
 
     def register_paths_from_env_var(self, env_var, package_name=None, mechanism=PluginLoadingMechanism.GUESS):
         """
@@ -198,15 +314,22 @@ class PluginFactory(object):
         :return: True if the registration is successful; False otherwise.
         """
 
+        import inspect
+
         if not inspect.isclass(plugin_class) or not issubclass(plugin_class, self._interface):
             return False
 
-        if not package_name:
-            class_id = self._get_identifier(plugin_class)
-            split_id = class_id.replace('.', '-').split('-')[0]
-            package_name = split_id if split_id != class_id else 'tpDcc'
+        try:
+            if not package_name:
+                class_id = self._get_identifier(plugin_class)
+                split_id = class_id.replace('.', '-').split('-')[0]
+                package_name = split_id if split_id != class_id else 'tpDcc'
+            self._index_plugin(plugin_class, package_name)
+        except BaseException:
+            logger.warning('Impossible to register plugin class: {}'.format(plugin_class), exc_info=True)
+            return False
 
-        self._plugins.setdefault(package_name, list).append(plugin_class)
+        self._plugins.setdefault(package_name, list()).append(plugin_class)
 
         return True
 
@@ -227,9 +350,7 @@ class PluginFactory(object):
         """
 
         package_name = package_name or 'tpDcc'
-        return {
-            self._get_identifier(plugin) for plugin in self._plugins.get(package_name, list())
-        }
+        return set(self._plugin_index.get(package_name, dict()).keys())
 
     def versions(self, identifier, package_name=None):
         """
@@ -243,8 +364,8 @@ class PluginFactory(object):
             return list()
 
         return sorted(
-            self._get_version(plugin) for plugin in self._plugins.get(
-                package_name, list()) if self._get_identifier(plugin) == identifier
+            (self._get_version(plugin) for plugin in self._plugin_index.get(
+                package_name, dict()).get(identifier, list())), key=_version_key
         )
 
     def plugins(self, package_name=None):
@@ -274,14 +395,11 @@ class PluginFactory(object):
             return None
 
         if package_name:
-            matching_plugins = [plugin for plugin in self._plugins.get(
-                package_name, list()) if self._get_identifier(plugin) == plugin_id]
+            matching_plugins = self._plugin_index.get(package_name, dict()).get(plugin_id, list())
         else:
             matching_plugins = list()
-            for plugins in list(self._plugins.values()):
-                for plugin in plugins:
-                    if self._get_identifier(plugin) == plugin_id:
-                        matching_plugins.append(plugin)
+            for plugins_index in list(self._plugin_index.values()):
+                matching_plugins.extend(plugins_index.get(plugin_id, list()))
 
         if not matching_plugins:
             logger.warning('No plugin with id "{}" found in package "{}"'.format(plugin_id, package_name))
@@ -290,22 +408,32 @@ class PluginFactory(object):
         if not self._version_identifier:
             return matching_plugins[0]
 
-        versions = {
-            self._get_version(plugin): plugin for plugin in matching_plugins
-        }
-        ordered_versions = [version.LooseVersion(str(v)) for v in list(versions.keys())]
+        if package_name:
+            version_tables = [self._versions_index.get(package_name, dict()).get(plugin_id, None)]
+        else:
+            version_tables = [versions_index.get(plugin_id, None) for versions_index in list(
+                self._versions_index.values())]
+        version_tables = [version_table for version_table in version_tables if version_table and version_table[0]]
+        if not version_tables:
+            logger.warning('No versioned plugin with id "{}" found in package "{}"'.format(plugin_id, package_name))
+            return None
 
         # If not version given, we return the plugin with the highest value
         if not plugin_version:
-            return versions[str(ordered_versions[0])]
+            plugins = max(version_tables, key=lambda table: table[0][-1])[1]
+            return plugins[-1]
 
-        plugin_version = version.LooseVersion(plugin_version)
-        if plugin_version not in ordered_versions:
-            logger.warning('No Plugin with id "{}" and version "{}" found in package "{}"'.format(
-                plugin_id, plugin_version, package_name))
-            return None
+        plugin_version = str(plugin_version)
+        version_key = _version_key(plugin_version)
+        for ordered_versions, plugins in version_tables:
+            index = bisect.bisect_left(ordered_versions, version_key)
+            if index < len(ordered_versions) and ordered_versions[index] == version_key:
+                return plugins[index]
 
-        return versions[str(plugin_version)]
+        logger.warning('No Plugin with id "{}" and version "{}" found in package "{}"'.format(
+            plugin_id, plugin_version, package_name))
+
+        return None
 
     def unregister_path(self, path, package_name=None):
         """
@@ -314,29 +442,50 @@ class PluginFactory(object):
         :param package_name: str, package name current registered plugins will belong to. Default to tDcc.
         """
 
-        registered_paths = self._registered_paths.copy()
-
-        self._plugins = list()
-        self._registered_paths = dict()
-
-        for pkg_name, registered_paths_dict in registered_paths.items():
-            for original_path, mechanism in registered_paths_dict.items():
-                if package_name == pkg_name and path_utils.clean_path(original_path) == path_utils.clean_path(path):
-                    continue
-                self.register_path(original_path, package_name=pkg_name, mechanism=mechanism)
+        package_name = package_name or 'tpDcc'
+        clean_path = path_utils.clean_path(path)
+
+        removed_plugins = list()
+        registered_paths = self._registered_paths.get(package_name, dict())
+        for original_path in list(registered_paths.keys()):
+            if path_utils.clean_path(original_path) == clean_path:
+                registered_paths.pop(original_path)
+                self._scan_cache.pop(original_path, None)
+                removed_plugins.extend(self._path_plugins.pop((package_name, original_path), list()))
+
+        # Modules loaded from the removed path are not referenced anymore
+        path_prefix = clean_path.rstrip('/') + '/'
+        for file_path in [file_path for file_path in self._source_loaded if file_path.startswith(path_prefix)]:
+            self._source_loaded.pop(file_path)
+
+        # Registered plugins are removed in memory, so there is no need to search and import plugins again. Only the
+        # registrations found in the given path are removed, plugins also found in other registered paths are kept
+        plugins = self._plugins.get(package_name, None)
+        if plugins and removed_plugins:
+            for plugin in removed_plugins:
+                plugins.remove(plugin)
+            self._plugin_index.pop(package_name, None)
+            self._versions_index.pop(package_name, None)
+            for plugin in self._plugins[package_name]:
+                self._index_plugin(plugin, package_name)
 
     def reload(self):
         """
         Clears all registered plugins and performs a search over all registered paths
         """
 
-        registered_paths = self._registered_paths.copy()
+        registered_paths = [
+            (package_name, original_path, mechanism) for package_name, registered_paths_dict in
+            self._registered_paths.items() for original_path, mechanism in registered_paths_dict.items()]
 
+        # Files found and modules loaded during previous searches are reused if they did not change on disk
+        scan_cache, source_loaded = self._scan_cache, self._source_loaded
+        self._scan_cache, self._source_loaded = dict(), dict()
         self.clear()
+        self._scan_cache, self._source_loaded = scan_cache, source_loaded
 
-        for package_name, registered_paths_dict in registered_paths.items():
-            for original_path, mechanism in registered_paths_dict.items():
-                self.register_path(original_path, package_name=package_name, mechanism=mechanism)
+        for package_name, original_path, mechanism in registered_paths:
+            self.register_path(original_path, package_name=package_name, mechanism=mechanism)
 
     def clear(self):
         """
@@ -344,12 +493,113 @@ class PluginFactory(object):
         """
 
         self._plugins.clear()
+        self._plugin_index.clear()
+        self._versions_index.clear()
         self._registered_paths.clear()
+        self._path_plugins.clear()
+        self._identifiers_cache.clear()
+        self._versions_cache.clear()
+        self._scan_cache.clear()
+        self._source_loaded.clear()
 
     # ============================================================================================================
     # INTERNAL
     # ============================================================================================================
 
+    def _get_plugin_files(self, path):
+        """
+        Internal function that returns all the candidate plugin files located within given path. Found files are
+        cached and only searched again if the modification time of any of the searched folders changes
+        :param path: str, absolute path to search plugin files in
+        :return: list(str)
+        """
+
+        cached = self._scan_cache.get(path, None)
+        if cached:
+            signature, file_paths = cached
+            try:
+                if all(_get_mtime(directory) == mtime for directory, mtime in signature):
+                    return file_paths
+            except OSError:
+                pass
+
+        clean = path_utils.clean_path
+        directories = dict()
+        file_paths = [clean(file_path) for file_path in self._iter_plugin_files(path, directories)]
+        self._scan_cache[path] = (tuple(directories.items()), file_paths)
+
+        return file_paths
+
+    def _iter_plugin_files(self, path, directories=None):
+        """
+        Internal generator that recursively yields all the candidate plugin files located within given path.
+        Directory entries types are retrieved using scandir (if available) to avoid an extra stat call per entry
+        :param path: str, absolute path to search plugin files in
+        :param directories: dict, optional dictionary that is filled with the modification time of searched folders
+        :return: generator(str)
+        """
+
+        file_match = self.REGEX_FILE_VALIDATOR.match
+        skip_dir_names = self._SKIP_DIR_NAMES
+        join = os.path.join
+        isdir = os.path.isdir
+        islink = os.path.islink
+
+        pending = deque([path])
+        while pending:
+            directory = pending.pop()
+            try:
+                if directories is not None:
+                    directories[directory] = _get_mtime(directory)
+                if scandir is not None:
+                    entries = [
+                        (entry.name, entry.path, entry.is_dir(follow_symlinks=False))
+                        for entry in scandir(directory)]
+                else:
+                    entries = list()
+                    for name in os.listdir(directory):
+                        entry_path = join(directory, name)
+                        # Symbolic links to folders are not followed, same as os.walk and scandir entries
+                        entries.append((name, entry_path, isdir(entry_path) and not islink(entry_path)))
+            except OSError:
+                continue
+
+            for name, entry_path, is_dir in entries:
+                if is_dir:
+                    if name not in skip_dir_names:
+                        pending.append(entry_path)
+                    continue
+
+                # Cheap string checks first, regex validator is only used for the leading letter check
+                if not name.endswith(('.py', '.pyc')) or name.startswith(('test', 'setup.py', '_')):
+                    continue
+                if not file_match(name):
+                    continue
+
+                yield entry_path
+
+    def _index_plugin(self, plugin, package_name):
+        """
+        Internal function that stores given plugin in the plugins index, so it can be retrieved by its identifier
+        without looping through all registered plugins. Plugin identifier and version are resolved before the index
+        is modified, so if they cannot be resolved the index is left untouched
+        :param plugin: class, plugin to index
+        :param package_name: str, package name given plugin belongs to
+        """
+
+        plugin_id = self._get_identifier(plugin)
+        version_key = _version_key(self._get_version(plugin)) if self._version_identifier else None
+
+        self._plugin_index.setdefault(package_name, dict()).setdefault(plugin_id, list()).append(plugin)
+
+        # Versions are kept sorted (from lowest to highest), so versioned lookups do not need to sort them again
+        if self._version_identifier:
+            ordered_versions, plugins = self._versions_index.setdefault(
+                package_name, dict()).setdefault(plugin_id, (list(), list()))
+            index = bisect.bisect_right(ordered_versions, version_key)
+            ordered_versions.insert(index, version_key)
+            plugins.insert(index, plugin)
+
     def _mechanism_import(self, file_path):
         """
         Internal function that will try to retrieve a module from a given path by looking current sys.path
@@ -358,18 +608,10 @@ class PluginFactory(object):
         """
 
         # In Python 2 we check the existence of an __init__ file
-        has_init = True
-        if python.is_python2():
-            has_init = False
-            file_dir = os.path.dirname(file_path)
-            for extension in ('.py', '.pyc'):
-                if os.path.isfile(os.path.join(file_dir, '__init__{}'.format(extension))):
-                    has_init = True
-                    break
-        if not has_init:
+        if python.is_python2() and not _has_init(os.path.dirname(file_path)):
             return None
 
-        module_name = modules.convert_to_dotted_path(file_path)
+        module_name = _dotted_for(file_path)
         if module_name:
             try:
                 return sys.modules[module_name]
@@ -385,7 +627,20 @@ class PluginFactory(object):
         :return: module or None
         """
 
-        return modules.load_module_from_source(file_path)
+        # Modules are only loaded again if their file was modified since the last time they were loaded
+        try:
+            mtime = _get_mtime(file_path)
+        except OSError:
+            mtime = None
+        cached = self._source_loaded.get(file_path, None)
+        if cached and mtime is not None and cached[0] == mtime:
+            return cached[1]
+
+        module = modules.load_module_from_source(file_path)
+        if module and mtime is not None:
+            self._source_loaded[file_path] = (mtime, module)
+
+        return module
 
     def _get_identifier(self, plugin):
         """
@@ -394,11 +649,16 @@ class PluginFactory(object):
         :return: str
         """
 
+        try:
+            return self._identifiers_cache[plugin]
+        except KeyError:
+            pass
+
         identifier = getattr(plugin, self._plugin_identifier)
+        if self._callable_predicate(identifier):
+            identifier = identifier()
 
-        predicate = inspect.ismethod if python.is_python2() else inspect.isfunction
-        if predicate(identifier):
-            return identifier()
+        self._identifiers_cache[plugin] = identifier
 
         return identifier
 
@@ -409,10 +669,15 @@ class PluginFactory(object):
         :return: int or float
         """
 
+        try:
+            return self._versions_cache[plugin]
+        except KeyError:
+            pass
+
         identifier = getattr(plugin, self._version_identifier)
+        if self._callable_predicate(identifier):
+            identifier = identifier()
 
-        predicate = inspect.ismethod if python.is_python2() else inspect.isfunction
-        if predicate(identifier):
-            return str(identifier())
+        plugin_version = self._versions_cache[plugin] = str(identifier)
 
-        return str(identifier)
+        return plugin_version